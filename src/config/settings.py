@@ -24,6 +24,7 @@ EMAIL_SETTINGS = {
     'USE_SSL': True,
     'VERIFY_SSL': False,  # Set to True in production
     'TIMEOUT': 30,  # seconds
+    'POLL_INTERVAL': int(os.getenv('EMAIL_POLL_INTERVAL', 60)),  # seconds between inbox checks
 }
 
 # Add validation for email configuration
@@ -46,6 +47,60 @@ LLAMA_SERVER_URL = os.getenv('LLAMA_SERVER_URL')
 LLAMA_MODEL = os.getenv('LLAMA_MODEL')
 LLAMA_CONTEXT_SIZE = int(os.getenv('LLAMA_CONTEXT_SIZE', 4096))
 
+# LLM Request Settings
+LLM_SETTINGS = {
+    'REQUEST_TIMEOUT': int(os.getenv('LLM_REQUEST_TIMEOUT', 30)),  # seconds per attempt, plus the per-token allowance
+    'REQUEST_TIMEOUT_PER_TOKEN': float(os.getenv('LLM_REQUEST_TIMEOUT_PER_TOKEN', 0.1)),  # seconds per prompt token
+    'REQUEST_DEADLINE': int(os.getenv('LLM_REQUEST_DEADLINE', 120)),  # seconds across all retries, plus the per-token allowance
+    'MAX_RETRIES': int(os.getenv('LLM_MAX_RETRIES', 4)),
+    'BACKOFF_BASE': float(os.getenv('LLM_BACKOFF_BASE', 1.0)),  # seconds
+    'BACKOFF_MAX': float(os.getenv('LLM_BACKOFF_MAX', 30.0)),  # seconds
+    'MIN_CONCURRENCY': int(os.getenv('LLM_MIN_CONCURRENCY', 1)),
+    'MAX_CONCURRENCY': int(os.getenv('LLM_MAX_CONCURRENCY', 8)),
+    'TARGET_LATENCY': float(os.getenv('LLM_TARGET_LATENCY', 5.0)),  # seconds of fixed overhead per call
+    'TARGET_LATENCY_PER_TOKEN': float(os.getenv('LLM_TARGET_LATENCY_PER_TOKEN', 0.05)),  # seconds per prompt token
+    'BREAKER_FAILURE_THRESHOLD': int(os.getenv('LLM_BREAKER_FAILURE_THRESHOLD', 5)),
+    'BREAKER_RESET_TIMEOUT': int(os.getenv('LLM_BREAKER_RESET_TIMEOUT', 30)),  # seconds
+}
+
+# LLM Scheduler Settings (scores are in seconds of equivalent waiting time)
+LLM_SCHEDULER_SETTINGS = {
+    'PRIORITY_WEIGHT': float(os.getenv('LLM_PRIORITY_WEIGHT', 60.0)),  # per priority class
+    'TOKENS_PER_SECOND': float(os.getenv('LLM_TOKENS_PER_SECOND', 50.0)),  # converts prompt size to cost
+    'AGING_RATE': float(os.getenv('LLM_AGING_RATE', 1.0)),  # score reduction per second waited
+    'SENDER_PENALTY': float(os.getenv('LLM_SENDER_PENALTY', 30.0)),  # per running job of the same sender
+    'QUEUE_TIMEOUT': int(os.getenv('LLM_QUEUE_TIMEOUT', 600)),  # seconds, for jobs without a deadline
+}
+
+# Service Container Settings
+SERVICE_SETTINGS = {
+    'HEALTH_CHECK_INTERVAL': int(os.getenv('SERVICE_HEALTH_CHECK_INTERVAL', 60)),  # seconds
+    'SHUTDOWN_TIMEOUT': int(os.getenv('SERVICE_SHUTDOWN_TIMEOUT', 30)),  # seconds
+    'LLAMA_POOL_SIZE': int(os.getenv('LLAMA_POOL_SIZE', 10)),  # pooled HTTP connections
+}
+
+# Worker / Supervisor Settings
+WORKER_SETTINGS = {
+    'NUM_WORKERS': int(os.getenv('NUM_WORKERS', 1)),  # >1, or HOST_COUNT >1, enables the multi-process supervisor
+    'HOST_INDEX': int(os.getenv('HOST_INDEX', 0)),  # this host's position among hosts sharing PENDING_DIR
+    'HOST_COUNT': int(os.getenv('HOST_COUNT', 1)),  # number of hosts sharing PENDING_DIR
+    # Must be on local disk: SQLite locking is unreliable on network filesystems
+    'LEASE_DB_PATH': os.getenv('LEASE_DB_PATH', os.path.expanduser('~/.blogapprover/leases.db')),
+    'LEASE_TTL': int(os.getenv('LEASE_TTL', 60)),  # seconds, renewed while an item is processed
+    'RESTART_DELAY': int(os.getenv('WORKER_RESTART_DELAY', 5)),  # seconds
+}
+
+def validate_worker_config():
+    """Validate worker and host sharding settings"""
+    if WORKER_SETTINGS['NUM_WORKERS'] < 1:
+        raise ValueError("NUM_WORKERS must be at least 1")
+    if WORKER_SETTINGS['HOST_COUNT'] < 1:
+        raise ValueError("HOST_COUNT must be at least 1")
+    if not 0 <= WORKER_SETTINGS['HOST_INDEX'] < WORKER_SETTINGS['HOST_COUNT']:
+        raise ValueError("HOST_INDEX must be between 0 and HOST_COUNT - 1")
+
+validate_worker_config()
+
 # Validate required environment variables
 required_vars = [
     'EMAIL_USERNAME', 
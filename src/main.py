@@ -1,19 +1,46 @@
 from services.file_service import watch_directory
-from services.email_service import get_email_handler
+from services.email_service import get_email_handler, watch_inbox
 from services.llama_service import get_llama_service
+from services.container import get_container
+from services.supervisor_service import run_supervisor
+from config.settings import SERVICE_SETTINGS, WORKER_SETTINGS
+import threading
 import logging
 
 logger = logging.getLogger(__name__)
 
 def main():
+    if WORKER_SETTINGS['NUM_WORKERS'] > 1 or WORKER_SETTINGS['HOST_COUNT'] > 1:
+        # Sharing PENDING_DIR with other hosts needs sharding and leases even
+        # with a single worker; each worker process owns its own service container
+        logger.info("Starting Blog Approver in supervisor mode")
+        run_supervisor(WORKER_SETTINGS['NUM_WORKERS'])
+        return
+
+    container = get_container()
+    inbox_stop = threading.Event()
+    inbox_thread = threading.Thread(
+        target=watch_inbox,
+        kwargs={'stop_event': inbox_stop},
+        name="inbox-monitor",
+        daemon=True
+    )
     try:
         logger.info("Starting Blog Approver")
+        container.start()
+        inbox_thread.start()
         watch_directory()
     except KeyboardInterrupt:
         logger.info("Shutting down Blog Approver")
     except Exception as e:
         logger.error(f"Error in main application: {str(e)}")
         raise
+    finally:
+        inbox_stop.set()
+        if inbox_thread.is_alive():
+            inbox_thread.join(timeout=SERVICE_SETTINGS['SHUTDOWN_TIMEOUT'])
+        # Drain in-flight work and close shared connections
+        container.stop()
 
 def send_test_email():
     """Send a test email to verify the configuration"""
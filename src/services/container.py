@@ -0,0 +1,173 @@
+import threading
+import logging
+from typing import Any, Callable, Dict, List, Optional
+from ..config.settings import SERVICE_SETTINGS
+
+logger = logging.getLogger(__name__)
+
+class ServiceContainer:
+    """
+    Process-wide registry handing out shared, thread-safe service instances.
+
+    Services are created lazily on first request and reused afterwards. A
+    service may optionally implement:
+
+    - ``is_healthy() -> bool``: checked by a background thread once per
+      health check interval while the container is running
+    - ``reconnect()``: called when the health check fails
+    - ``close(timeout)``: called on shutdown, should drain in-flight work
+    """
+
+    def __init__(self, health_check_interval: float = SERVICE_SETTINGS['HEALTH_CHECK_INTERVAL']):
+        self.health_check_interval = health_check_interval
+        self._lock = threading.RLock()
+        self._services: Dict[str, Any] = {}
+        self._order: List[str] = []
+        # One lock per service name, so building a slow service does not block the registry
+        self._creation_locks: Dict[str, threading.Lock] = {}
+        self._stopped = False
+        self._stop_event = threading.Event()
+        self._health_thread: Optional[threading.Thread] = None
+
+    def start(self):
+        """Start the background health checks"""
+        with self._lock:
+            self._stopped = False
+            if self.running:
+                return
+            self._stop_event.clear()
+            self._health_thread = threading.Thread(
+                target=self._health_loop,
+                name="service-health-check",
+                daemon=True
+            )
+            self._health_thread.start()
+            logger.info("🧰 Service container started")
+
+    def get(self, name: str, factory: Callable[[], Any]) -> Any:
+        """
+        Return the shared instance registered under ``name``, creating it if needed
+
+        Args:
+            name (str): Registry key of the service
+            factory (Callable): Builds the service when it does not exist yet
+
+        Returns:
+            Any: The shared service instance
+        """
+        with self._lock:
+            self._check_not_stopped(name)
+            service = self._services.get(name)
+            if service is not None:
+                return service
+            creation_lock = self._creation_locks.setdefault(name, threading.Lock())
+
+        with creation_lock:
+            # Another thread may have built it while we waited
+            with self._lock:
+                self._check_not_stopped(name)
+                service = self._services.get(name)
+                if service is not None:
+                    return service
+
+            logger.info(f"🔧 Creating shared service '{name}'")
+            service = factory()
+
+            with self._lock:
+                stopped = self._stopped
+                if not stopped:
+                    self._services[name] = service
+                    self._order.append(name)
+            if stopped:
+                self._close_service(name, service, timeout=0)
+                self._check_not_stopped(name)
+            return service
+
+    def _check_not_stopped(self, name: str):
+        if self._stopped:
+            raise RuntimeError(f"Service container is stopped, cannot provide '{name}'")
+
+    def _health_loop(self):
+        """Run health checks every interval until the container stops"""
+        while not self._stop_event.wait(self.health_check_interval):
+            self.check_health()
+
+    def check_health(self):
+        """Check every registered service once, reconnecting unhealthy ones"""
+        with self._lock:
+            services = [(name, self._services[name]) for name in self._order]
+
+        for name, service in services:
+            self._check_service(name, service)
+
+    def _check_service(self, name: str, service: Any):
+        check = getattr(service, 'is_healthy', None)
+        if check is None:
+            return
+
+        try:
+            healthy = check()
+        except Exception as e:
+            logger.warning(f"⚠️ Health check for '{name}' raised: {str(e)}")
+            healthy = False
+
+        if healthy:
+            return
+
+        reconnect = getattr(service, 'reconnect', None)
+        if reconnect is None:
+            logger.warning(f"⚠️ Service '{name}' is unhealthy and cannot reconnect")
+            return
+
+        try:
+            logger.info(f"🔄 Reconnecting unhealthy service '{name}'")
+            reconnect()
+        except Exception as e:
+            logger.error(f"❌ Reconnecting '{name}' failed: {str(e)}")
+
+    def stop(self, timeout: Optional[float] = SERVICE_SETTINGS['SHUTDOWN_TIMEOUT']):
+        """
+        Stop handing out services and close them in reverse creation order
+
+        Args:
+            timeout (float): Seconds each service may spend draining in-flight work
+        """
+        with self._lock:
+            if self._stopped:
+                return
+            self._stopped = True
+            health_thread = self._health_thread
+            self._health_thread = None
+            services = [(name, self._services[name]) for name in reversed(self._order)]
+            self._services.clear()
+            self._order.clear()
+
+        self._stop_event.set()
+        if health_thread is not None:
+            health_thread.join(timeout=timeout)
+
+        for name, service in services:
+            self._close_service(name, service, timeout)
+
+        logger.info("🧰 Service container stopped")
+
+    def _close_service(self, name: str, service: Any, timeout: Optional[float]):
+        close = getattr(service, 'close', None)
+        if close is None:
+            return
+        try:
+            close(timeout=timeout)
+            logger.info(f"👋 Closed service '{name}'")
+        except Exception as e:
+            logger.error(f"❌ Error closing service '{name}': {str(e)}")
+
+    @property
+    def running(self) -> bool:
+        """True while the background health checks are running"""
+        return self._health_thread is not None and self._health_thread.is_alive()
+
+_container = ServiceContainer()
+
+def get_container() -> ServiceContainer:
+    """Return the process-wide ServiceContainer"""
+    return _container
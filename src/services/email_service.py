@@ -1,18 +1,25 @@
 from exchangelib import Credentials, Account, DELEGATE, Message, HTMLBody
 from exchangelib.protocol import BaseProtocol, NoVerifyHTTPAdapter
 import logging
+import threading
 from ..config.settings import (
     EMAIL_USERNAME, 
     EMAIL_PASSWORD, 
-    EMAIL_ADDRESS
+    EMAIL_ADDRESS,
+    EMAIL_SETTINGS,
+    PENDING_DIR
 )
 import markdown
+import re
 from datetime import datetime, timedelta
+from pathlib import Path
 from enum import Enum
 from typing import Optional, Dict, Any
 from ..services.llama_service import get_llama_service
+from ..services.resilience import LLMUnavailableError
+from ..services.container import get_container
+from ..services.lease_service import WorkerContext
 from ..prompts.email_prompts import APPROVAL_ANALYSIS_PROMPT
-from ..prompts.blog_prompts import BLOG_REVISION_SYSTEM_PROMPT, BLOG_REVISION_PROMPT
 import json
 
 class ApprovalStatus(Enum):
@@ -24,9 +31,11 @@ logger = logging.getLogger(__name__)
 BaseProtocol.HTTP_ADAPTER_CLS = NoVerifyHTTPAdapter
 
 class EmailHandler:
-    def __init__(self):
+    def __init__(self, llm_service=None):
         self.account = None
-        self.llm_service = get_llama_service()
+        self.llm_service = llm_service or get_llama_service()
+        # Guards the Exchange account, which is shared across threads
+        self._lock = threading.RLock()
         self._setup_account()
 
     def _setup_account(self):
@@ -50,6 +59,54 @@ class EmailHandler:
             logger.error(f"❌ Exchange connection failed: {str(e)}")
             raise
 
+    def is_connected(self) -> bool:
+        """Return True if an Exchange account has been set up"""
+        return self.account is not None
+
+    def is_healthy(self) -> bool:
+        """Check that the Exchange connection still responds"""
+        if not self.is_connected():
+            return False
+        try:
+            with self._lock:
+                self.account.inbox.refresh()
+            return True
+        except Exception as e:
+            logger.warning(f"⚠️ Exchange health check failed: {str(e)}")
+            return False
+
+    def reconnect(self):
+        """Tear down the current Exchange connection and set up a new one"""
+        with self._lock:
+            self._close_account()
+            self._setup_account()
+
+    def close(self, timeout: float = None):
+        """
+        Wait for the in-progress email operation to finish and close the connection
+
+        Args:
+            timeout (float): Maximum seconds to wait for the in-progress operation
+        """
+        acquired = self._lock.acquire(timeout=-1 if timeout is None else timeout)
+        if not acquired:
+            logger.warning("⚠️ Closing Exchange connection while an operation is still running")
+        try:
+            self._close_account()
+        finally:
+            if acquired:
+                self._lock.release()
+
+    def _close_account(self):
+        """Close the pooled connections of the current Exchange account"""
+        if self.account is None:
+            return
+        try:
+            self.account.protocol.close()
+        except Exception as e:
+            logger.warning(f"⚠️ Error closing Exchange connection: {str(e)}")
+        self.account = None
+
     def send_markdown_email(self, subject: str, markdown_content: str, to_recipients: list):
         """
         Send an email with markdown content converted to HTML
@@ -63,25 +120,27 @@ class EmailHandler:
             # Convert markdown to HTML
             html_content = markdown.markdown(markdown_content)
             
-            message = Message(
-                account=self.account,
-                subject=subject,
-                body=HTMLBody(html_content),
-                to_recipients=to_recipients
-            )
-            message.send()
+            with self._lock:
+                message = Message(
+                    account=self.account,
+                    subject=subject,
+                    body=HTMLBody(html_content),
+                    to_recipients=to_recipients
+                )
+                message.send()
             logger.info(f"📧 Email sent to {', '.join(to_recipients)}")
             
         except Exception as e:
             logger.error(f"❌ Failed to send email: {str(e)}")
             raise
 
-    def check_inbox(self, hours_back=24):
+    def check_inbox(self, hours_back=24, worker: WorkerContext = None):
         """
         Check inbox for unread messages, process them, and clean up
         
         Args:
             hours_back (int): Number of hours to look back for emails
+            worker (WorkerContext): Shard and lease context, None to process every reply
         
         Returns:
             list: List of processed email items
@@ -90,27 +149,45 @@ class EmailHandler:
             # Calculate time threshold
             time_threshold = datetime.now() - timedelta(hours=hours_back)
             
-            # Filter for unread messages
-            unread_messages = self.account.inbox.filter(
-                is_read=False,
-                datetime_received__gt=time_threshold
-            )
+            # Filter for unread messages, fetching them up front so the
+            # Exchange account is not held while the LLM works on each one
+            with self._lock:
+                unread_messages = list(self.account.inbox.filter(
+                    is_read=False,
+                    datetime_received__gt=time_threshold
+                ))
             
             processed_items = []
             for item in unread_messages:
+                key = f"reply:{item.message_id}"
+                if worker is not None and not worker.claim(key):
+                    continue
                 try:
                     processed_item = self._process_email(item)
                     if processed_item:
                         processed_items.append(processed_item)
-                        self.handle_approval_response(processed_item)
+                        self.handle_approval_response(
+                            processed_item,
+                            self._find_pending_post(processed_item['subject'])
+                        )
                     
                     # Move to deleted items instead of just marking as read
-                    item.move_to_trash()
+                    with self._lock:
+                        item.move_to_trash()
                     logger.info(f"🗑️ Moved processed email '{item.subject}' to trash")
+                    if worker is not None:
+                        worker.complete(key)
                     
+                except LLMUnavailableError as e:
+                    # Leave the email unread so it is picked up on a later check
+                    logger.warning(f"⏸️ Deferring email {item.subject}: {str(e)}")
+                    continue
                 except Exception as e:
                     logger.error(f"❌ Error processing email {item.subject}: {str(e)}")
                     continue
+                finally:
+                    if worker is not None:
+                        worker.release(key)
             
             return processed_items
             
@@ -143,23 +220,29 @@ class EmailHandler:
                     }
                     for attachment in email_item.attachments
                 ] if email_item.has_attachments else [],
-                'approval_status': self._determine_approval_status(email_item.body),
+                'approval_status': self._determine_approval_status(
+                    email_item.body,
+                    sender=email_item.sender.email_address
+                ),
                 'feedback': email_item.body if email_item.body else ''
             }
             
             logger.info(f"📧 Processed email with status: {processed_data['approval_status'].value}")
             return processed_data
             
+        except LLMUnavailableError:
+            raise
         except Exception as e:
             logger.error(f"❌ Error processing email: {str(e)}")
             return None
 
-    def _determine_approval_status(self, email_body: str) -> ApprovalStatus:
+    def _determine_approval_status(self, email_body: str, sender: str = None) -> ApprovalStatus:
         """
         Use LLM to analyze email content and determine if it's an approval or revision request
         
         Args:
             email_body (str): The email body content
+            sender (str): Address of the email sender, used for scheduling fairness
             
         Returns:
             ApprovalStatus: The determined approval status
@@ -172,7 +255,7 @@ class EmailHandler:
             prompt = APPROVAL_ANALYSIS_PROMPT.format(email_content=email_body)
             
             # Get LLM analysis
-            response = self.llm_service.analyze_text(prompt)
+            response = self.llm_service.analyze_text(prompt, sender=sender)
             
             try:
                 # Parse JSON response
@@ -197,17 +280,36 @@ class EmailHandler:
                 logger.error(f"❌ Failed to parse LLM response: {str(e)}")
                 return ApprovalStatus.UNKNOWN
                 
+        except LLMUnavailableError:
+            # Defer the email rather than classifying it as unknown
+            raise
         except Exception as e:
             logger.error(f"❌ Error in LLM analysis: {str(e)}")
             return ApprovalStatus.UNKNOWN
 
-    def handle_approval_response(self, processed_email: Dict[str, Any], original_content: str) -> None:
+    def _find_pending_post(self, subject: str) -> Optional[str]:
+        """
+        Find the pending blog post a reply refers to
+        
+        Args:
+            subject (str): Subject of the reply, e.g. "Re: my-post"
+            
+        Returns:
+            str: Markdown content of the post whose file name matches the subject, or None
+        """
+        title = re.sub(r'^((re|fw|fwd):\s*)+', '', subject or '', flags=re.IGNORECASE).strip().lower()
+        for path in Path(PENDING_DIR).glob('*.md'):
+            if path.stem.lower() == title:
+                return path.read_text(encoding='utf-8')
+        return None
+
+    def handle_approval_response(self, processed_email: Dict[str, Any], original_content: Optional[str]) -> None:
         """
         Handle the email response based on its approval status
         
         Args:
             processed_email (Dict[str, Any]): The processed email data
-            original_content (str): The original blog post content
+            original_content (str): The original blog post content, None if it was not found
         """
         try:
             status = processed_email['approval_status']
@@ -217,15 +319,16 @@ class EmailHandler:
             if status == ApprovalStatus.NEEDS_REVISION:
                 logger.info(f"📝 Revising post '{subject}' based on feedback")
                 
-                # Prepare revision prompt
-                revision_prompt = BLOG_REVISION_PROMPT.format(
-                    system_prompt=BLOG_REVISION_SYSTEM_PROMPT,
-                    original_content=original_content,
-                    feedback=feedback
-                )
+                if original_content is None:
+                    logger.error(f"❌ No pending post found for '{subject}', cannot revise")
+                    return
                 
                 # Get revised content
-                revised_content = self.llm_service.revise_content(revision_prompt)
+                revised_content = self.llm_service.revise_content(
+                    original_content,
+                    feedback,
+                    sender=processed_email['sender']
+                )
                 
                 if revised_content:
                     logger.info("✅ Blog post revised successfully")
@@ -251,8 +354,32 @@ class EmailHandler:
             raise
 
 def get_email_handler():
-    """Factory function to create and return an EmailHandler instance"""
-    return EmailHandler()
+    """Return the shared EmailHandler instance from the service container"""
+    return get_container().get('email', EmailHandler)
+
+def watch_inbox(
+    worker: WorkerContext = None,
+    stop_event: threading.Event = None,
+    interval: int = EMAIL_SETTINGS['POLL_INTERVAL']
+):
+    """
+    Check the inbox every ``interval`` seconds until ``stop_event`` is set.
+    
+    Args:
+        worker (WorkerContext): Shard and lease context, None to process every reply
+        stop_event (threading.Event): Set to stop the loop
+        interval (int): Seconds between inbox checks
+    """
+    stop_event = stop_event or threading.Event()
+    logger.info("📬 Starting inbox monitoring")
+    while not stop_event.is_set():
+        try:
+            get_email_handler().check_inbox(worker=worker)
+        except Exception as e:
+            # check_inbox already logged the details; try again next interval
+            logger.warning(f"⚠️ Inbox check failed, retrying in {interval}s: {str(e)}")
+        stop_event.wait(interval)
+    logger.info("👋 Stopping inbox monitor")
 
 if __name__ == "__main__":
     # Test the email connection
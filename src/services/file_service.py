@@ -1,9 +1,11 @@
 from watchdog.observers import Observer
 from watchdog.events import FileSystemEventHandler
 import time
+import hashlib
 import logging
 from pathlib import Path
 from src.config.settings import PENDING_DIR, APPROVED_DIR
+from src.services.lease_service import WorkerContext
 
 # Set up logging
 logging.basicConfig(
@@ -15,6 +17,15 @@ logger = logging.getLogger(__name__)
 
 class MarkdownHandler(FileSystemEventHandler):
     """Handler for monitoring markdown files in the pending directory."""
+
+    def __init__(self, worker: WorkerContext = None):
+        """
+        Args:
+            worker (WorkerContext): Shard and lease context when running as one
+                of several workers, None when running standalone
+        """
+        super().__init__()
+        self.worker = worker
     
     def on_created(self, event):
         """Handle creation of new files."""
@@ -24,7 +35,7 @@ class MarkdownHandler(FileSystemEventHandler):
         file_path = Path(event.src_path)
         if file_path.suffix.lower() == '.md':
             logger.info(f"📝 New markdown file detected: {file_path.name}")
-            self.process_markdown_file(file_path)
+            self._dispatch(file_path)
 
     def on_modified(self, event):
         """Handle modifications to existing files."""
@@ -34,7 +45,31 @@ class MarkdownHandler(FileSystemEventHandler):
         file_path = Path(event.src_path)
         if file_path.suffix.lower() == '.md':
             logger.info(f"🔄 Markdown file modified: {file_path.name}")
+            self._dispatch(file_path)
+
+    def _dispatch(self, file_path: Path):
+        """
+        Process the file if this worker owns it, holding its lease meanwhile.
+        Each version of the file content is processed only once.
+        """
+        if self.worker is None:
+            self.process_markdown_file(file_path)
+            return
+
+        key = f"post:{file_path.name}"
+        try:
+            version = hashlib.sha1(file_path.read_bytes()).hexdigest()
+        except OSError as e:
+            logger.error(f"❌ Cannot read {file_path.name}: {str(e)}")
+            return
+
+        if not self.worker.claim(key, version):
+            return
+        try:
             self.process_markdown_file(file_path)
+            self.worker.complete(key, version)
+        finally:
+            self.worker.release(key)
 
     def process_markdown_file(self, file_path: Path):
         """
@@ -44,22 +79,26 @@ class MarkdownHandler(FileSystemEventHandler):
         logger.info(f"⚙️ Processing file: {file_path.name}")
         # TODO: Implement processing logic here
 
-def watch_directory(directory_path: str = PENDING_DIR):
+def watch_directory(directory_path: str = PENDING_DIR, worker: WorkerContext = None):
     """
     Initialize and start the directory observer.
     
     Args:
         directory_path (str): Path to the directory to monitor
+        worker (WorkerContext): Shard and lease context, None to process every file
     """
     # Ensure directories exist
     for dir_path in [PENDING_DIR, APPROVED_DIR]:
         Path(dir_path).mkdir(parents=True, exist_ok=True)
     
-    event_handler = MarkdownHandler()
+    event_handler = MarkdownHandler(worker)
     observer = Observer()
     observer.schedule(event_handler, directory_path, recursive=False)
     
-    logger.info(f"🔍 Starting monitoring of {directory_path}")
+    if worker is None:
+        logger.info(f"🔍 Starting monitoring of {directory_path}")
+    else:
+        logger.info(f"🔍 Starting monitoring of {directory_path} (shard {worker.index + 1}/{worker.count})")
     observer.start()
     
     try:
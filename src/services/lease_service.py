@@ -0,0 +1,208 @@
+import hashlib
+import logging
+import os
+import socket
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict
+from ..config.settings import WORKER_SETTINGS
+
+logger = logging.getLogger(__name__)
+
+def shard_for(key: str, num_shards: int) -> int:
+    """
+    Map a key to a shard index that is stable across processes and hosts
+
+    Args:
+        key (str): Post path, post id or message id
+        num_shards (int): Total number of shards
+
+    Returns:
+        int: Shard index in ``range(num_shards)``
+    """
+    digest = hashlib.sha1(key.encode('utf-8')).digest()
+    return int.from_bytes(digest[:8], 'big') % num_shards
+
+class LeaseStore:
+    """
+    SQLite-backed leases so that only one worker handles a post or reply at a time.
+
+    Finished items are recorded together with a version (e.g. a content hash)
+    so that a later claim on the same version is refused instead of
+    processing the item again.
+
+    The database must be on local disk, since SQLite locking is unreliable on
+    network filesystems. It coordinates the worker processes of one host;
+    hosts sharing ``PENDING_DIR`` are kept apart by sharding instead.
+    """
+
+    def __init__(self, db_path: str = None, ttl: int = WORKER_SETTINGS['LEASE_TTL']):
+        self.db_path = db_path or WORKER_SETTINGS['LEASE_DB_PATH']
+        self.ttl = ttl
+        self._setup_db()
+
+    def _connect(self) -> sqlite3.Connection:
+        # Autocommit mode so transactions are controlled explicitly below
+        return sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+
+    def _setup_db(self):
+        """Create the leases table if it does not exist yet"""
+        Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+        conn = self._connect()
+        try:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS leases ("
+                "key TEXT PRIMARY KEY, owner TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS completed ("
+                "key TEXT PRIMARY KEY, version TEXT NOT NULL, completed_at REAL NOT NULL)"
+            )
+        finally:
+            conn.close()
+
+    def acquire(self, key: str, owner: str, version: str = '') -> bool:
+        """
+        Try to take the lease on ``key``
+
+        Args:
+            key (str): The leased resource, e.g. ``post:<name>``
+            owner (str): Identifier of the worker taking the lease
+            version (str): Version of the item; a completed version is not leased again
+
+        Returns:
+            bool: True if ``owner`` now holds the lease
+        """
+        now = time.time()
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            done = conn.execute(
+                "SELECT 1 FROM completed WHERE key = ? AND version = ?", (key, version)
+            ).fetchone()
+            if done:
+                conn.execute("ROLLBACK")
+                return False
+            row = conn.execute(
+                "SELECT owner, expires_at FROM leases WHERE key = ?", (key,)
+            ).fetchone()
+            if row and row[0] != owner and row[1] > now:
+                conn.execute("ROLLBACK")
+                return False
+            conn.execute(
+                "INSERT OR REPLACE INTO leases (key, owner, expires_at) VALUES (?, ?, ?)",
+                (key, owner, now + self.ttl)
+            )
+            conn.execute("COMMIT")
+            return True
+        finally:
+            conn.close()
+
+    def mark_completed(self, key: str, version: str = ''):
+        """Record that ``version`` of ``key`` has been processed"""
+        conn = self._connect()
+        try:
+            conn.execute(
+                "INSERT OR REPLACE INTO completed (key, version, completed_at) VALUES (?, ?, ?)",
+                (key, version, time.time())
+            )
+        finally:
+            conn.close()
+
+    def renew(self, key: str, owner: str) -> bool:
+        """
+        Extend the lease on ``key`` by another TTL
+
+        Returns:
+            bool: False if ``owner`` no longer holds the lease
+        """
+        conn = self._connect()
+        try:
+            cursor = conn.execute(
+                "UPDATE leases SET expires_at = ? WHERE key = ? AND owner = ?",
+                (time.time() + self.ttl, key, owner)
+            )
+            return cursor.rowcount == 1
+        finally:
+            conn.close()
+
+    def release(self, key: str, owner: str):
+        """Release the lease on ``key`` if ``owner`` still holds it"""
+        conn = self._connect()
+        try:
+            conn.execute("DELETE FROM leases WHERE key = ? AND owner = ?", (key, owner))
+        finally:
+            conn.close()
+
+class WorkerContext:
+    """
+    Identity and shard assignment of a single worker process.
+
+    ``index`` and ``count`` are global across hosts, so workers on different
+    hosts never own the same keys.
+    """
+
+    def __init__(self, index: int = 0, count: int = 1, leases: LeaseStore = None):
+        self.index = index
+        self.count = count
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:{index}"
+        self.leases = leases or LeaseStore()
+        self._renewals: Dict[str, threading.Event] = {}
+
+    def _renew_until(self, key: str, stop: threading.Event):
+        """Keep the lease on ``key`` alive until ``stop`` is set"""
+        while not stop.wait(self.leases.ttl / 3):
+            try:
+                if not self.leases.renew(key, self.worker_id):
+                    logger.warning(f"⚠️ Lost lease on {key}")
+                    return
+            except sqlite3.Error as e:
+                logger.warning(f"⚠️ Failed to renew lease on {key}: {str(e)}")
+
+    def owns(self, key: str) -> bool:
+        """Return True if ``key`` belongs to this worker's shard"""
+        return shard_for(key, self.count) == self.index
+
+    def claim(self, key: str, version: str = '') -> bool:
+        """
+        Claim ``key`` for processing
+
+        Args:
+            key (str): The item to claim
+            version (str): Version of the item, e.g. a content hash
+
+        Returns:
+            bool: True if the key is in this worker's shard, that version has
+                not been completed yet and its lease was acquired
+        """
+        if not self.owns(key):
+            return False
+        if not self.leases.acquire(key, self.worker_id, version):
+            logger.info(f"🔒 {key} is leased by another worker or already processed, skipping")
+            return False
+
+        stop = threading.Event()
+        self._renewals[key] = stop
+        threading.Thread(
+            target=self._renew_until,
+            args=(key, stop),
+            name=f"lease-renewal-{key}",
+            daemon=True
+        ).start()
+        return True
+
+    def complete(self, key: str, version: str = ''):
+        """Record ``key`` as processed so it is not claimed again"""
+        self.leases.mark_completed(key, version)
+
+    def release(self, key: str):
+        """Release a key previously claimed with ``claim``"""
+        stop = self._renewals.pop(key, None)
+        if stop is not None:
+            stop.set()
+        try:
+            self.leases.release(key, self.worker_id)
+        except sqlite3.Error as e:
+            logger.warning(f"⚠️ Failed to release lease on {key}: {str(e)}")
@@ -1,10 +1,18 @@
 import requests
+from requests.adapters import HTTPAdapter
 import logging
+import threading
+import time
 from ..config.settings import (
     LLAMA_SERVER_URL, 
     LLAMA_MODEL, 
-    LLAMA_CONTEXT_SIZE
+    LLAMA_CONTEXT_SIZE,
+    LLM_SETTINGS,
+    SERVICE_SETTINGS
 )
+from .container import get_container
+from .resilience import AdaptiveLimiter, CircuitBreaker, LLMUnavailableError, backoff_delay
+from .scheduler import LLMScheduler, Priority, estimate_tokens
 
 logger = logging.getLogger(__name__)
 
@@ -13,37 +21,206 @@ class LlamaService:
         self.base_url = LLAMA_SERVER_URL
         self.model = LLAMA_MODEL
         self.context_size = LLAMA_CONTEXT_SIZE
-        
-    def _make_request(self, prompt: str) -> dict:
-        """Make a request to the Llama server"""
+        self.pool_size = SERVICE_SETTINGS['LLAMA_POOL_SIZE']
+        self._in_flight = 0
+        self._idle = threading.Condition()
+        self.limiter = AdaptiveLimiter()
+        # One breaker per priority class, so slow revisions cannot shed classifications
+        self.breakers = {priority: CircuitBreaker() for priority in Priority}
+        # Runs as many jobs at once as the adaptive limiter currently allows
+        self.scheduler = LLMScheduler(capacity=lambda: self.limiter.limit)
+        self.session = self._create_session()
+
+    def _create_session(self) -> requests.Session:
+        """Create an HTTP session with a connection pool shared across threads"""
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        return session
+
+    def _make_request(
+        self,
+        prompt: str,
+        priority: Priority = Priority.CLASSIFICATION,
+        sender: str = None,
+        deadline: float = None
+    ) -> dict:
+        """
+        Make a request to the Llama server
+
+        Each attempt waits its turn in the scheduler, then goes through the
+        circuit breaker of its priority class and the adaptive concurrency
+        limiter. Transient
+        failures are retried with jittered exponential backoff; the scheduler
+        slot is given up while backing off. Queueing, attempts and backoff
+        all count against a single deadline.
+
+        Args:
+            prompt (str): The prompt to send
+            priority (Priority): Scheduling priority class of the request
+            sender (str): Email address the request is for, used for scheduling fairness
+            deadline (float): ``time.monotonic()`` value the request must finish by,
+                defaults to ``LLM_SETTINGS['REQUEST_DEADLINE']`` plus a per-token allowance from now
+
+        Raises:
+            LLMUnavailableError: If the request was shed or ran out of time
+            requests.exceptions.RequestException: On a non-retryable error
+        """
         payload = {
             'model': self.model,
             'prompt': prompt,
             'max_tokens': self.context_size
         }
+        if deadline is None:
+            deadline = self._deadline_for(prompt)
+        tokens = estimate_tokens(prompt)
         
+        with self._idle:
+            self._in_flight += 1
         try:
-            response = requests.post(
+            attempt = 0
+            while True:
+                response = self.scheduler.run(
+                    lambda: self._attempt_request(payload, deadline, tokens, priority),
+                    priority,
+                    prompt,
+                    sender,
+                    deadline=deadline
+                )
+                if response is not None:
+                    return response
+
+                delay = backoff_delay(attempt)
+                attempt += 1
+                if attempt > LLM_SETTINGS['MAX_RETRIES'] or time.monotonic() + delay >= deadline:
+                    raise LLMUnavailableError(f"Llama server request failed after {attempt} attempt(s)")
+                logger.info(f"🔁 Retrying Llama request in {delay:.1f}s (attempt {attempt + 1})")
+                time.sleep(delay)
+        finally:
+            with self._idle:
+                self._in_flight -= 1
+                self._idle.notify_all()
+
+    @staticmethod
+    def _attempt_timeout(tokens: int) -> float:
+        """Seconds a single attempt on a prompt of ``tokens`` estimated tokens may take"""
+        return LLM_SETTINGS['REQUEST_TIMEOUT'] + tokens * LLM_SETTINGS['REQUEST_TIMEOUT_PER_TOKEN']
+
+    @staticmethod
+    def _deadline_for(prompt: str) -> float:
+        """``time.monotonic()`` value a request for ``prompt`` must finish by, retries included"""
+        allowance = estimate_tokens(prompt) * LLM_SETTINGS['REQUEST_TIMEOUT_PER_TOKEN']
+        return time.monotonic() + LLM_SETTINGS['REQUEST_DEADLINE'] + allowance
+
+    def _attempt_request(
+        self,
+        payload: dict,
+        deadline: float,
+        tokens: int = 0,
+        priority: Priority = Priority.CLASSIFICATION
+    ):
+        """
+        Send a single request attempt
+
+        Args:
+            payload (dict): Request body
+            deadline (float): ``time.monotonic()`` value the attempt must finish by
+            tokens (int): Estimated prompt tokens, used for the attempt timeout
+                and to judge the observed latency
+            priority (Priority): Priority class, selecting the circuit breaker
+
+        Returns:
+            dict: The parsed response, or None if the attempt failed and may be retried
+        """
+        breaker = self.breakers[priority]
+        if not breaker.allow():
+            raise LLMUnavailableError("Llama circuit breaker is open, shedding request")
+
+        if not self.limiter.acquire(timeout=max(0, deadline - time.monotonic())):
+            # Local congestion, not an LLM error: hand back a half-open trial uncounted
+            breaker.cancel()
+            raise LLMUnavailableError("Timed out waiting for Llama concurrency slot")
+
+        started = time.monotonic()
+        success = False
+        try:
+            timeout = min(self._attempt_timeout(tokens), max(0.1, deadline - started))
+            response = self.session.post(
                 f"{self.base_url}/api/1.0/text/completion",
                 json=payload,
-                timeout=30
+                timeout=timeout
             )
+            if response.status_code == 429 or response.status_code >= 500:
+                logger.warning(f"⚠️ Llama server returned {response.status_code}")
+                breaker.record_failure()
+                return None
             response.raise_for_status()
-            return response.json()
+            result = response.json()
+            success = True
+            breaker.record_success()
+            return result
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+            logger.warning(f"⚠️ Llama server request failed: {str(e)}")
+            breaker.record_failure()
+            return None
         except requests.exceptions.RequestException as e:
+            # Client errors will not succeed on retry and say nothing about server health
             logger.error(f"❌ Llama server request failed: {str(e)}")
+            breaker.record_success()
+            success = True
             raise
+        except Exception as e:
+            # Always record an outcome, otherwise a half-open breaker stays stuck
+            logger.error(f"❌ Unexpected error in Llama request: {str(e)}")
+            breaker.record_failure()
+            raise
+        finally:
+            self.limiter.release(time.monotonic() - started, success, tokens)
+
+    def is_healthy(self) -> bool:
+        """Check that the Llama server is reachable"""
+        try:
+            response = self.session.get(self.base_url, timeout=5)
+            return response.ok
+        except requests.exceptions.RequestException as e:
+            logger.warning(f"⚠️ Llama health check failed: {str(e)}")
+            return False
+
+    def reconnect(self):
+        """Replace the HTTP session, dropping any stale pooled connections"""
+        old_session = self.session
+        self.session = self._create_session()
+        old_session.close()
+        logger.info("✅ Llama session re-established")
+
+    def close(self, timeout: float = None):
+        """
+        Wait for in-flight requests to finish and close the HTTP session
 
-    def revise_content(self, original_content: str, feedback: str) -> str:
+        Args:
+            timeout (float): Maximum seconds to wait for in-flight requests
+        """
+        with self._idle:
+            drained = self._idle.wait_for(lambda: self._in_flight == 0, timeout=timeout)
+        if not drained:
+            logger.warning(f"⚠️ Closing Llama session with {self._in_flight} request(s) in flight")
+        self.session.close()
+
+    def revise_content(self, original_content: str, feedback: str, sender: str = None) -> str:
         """
         Revise content based on feedback using Llama
         
         Args:
             original_content (str): The original markdown content
             feedback (str): Feedback to incorporate
+            sender (str): Email address the revision is for, used for scheduling fairness
             
         Returns:
             str: Revised content
+            
+        Raises:
+            LLMUnavailableError: If the LLM is unhealthy and the revision should be retried later
         """
         prompt = (
             f"# Original Content\n\n{original_content}\n\n"
@@ -54,8 +231,9 @@ class LlamaService:
             "Return only the revised content without any additional commentary."
         )
         
+        deadline = self._deadline_for(prompt)
         try:
-            response = self._make_request(prompt)
+            response = self._make_request(prompt, Priority.REVISION, sender, deadline)
             revised_content = response.get('choices', [{}])[0].get('text', '').strip()
             
             if not revised_content:
@@ -65,35 +243,28 @@ class LlamaService:
             logger.info("✅ Content successfully revised")
             return revised_content
             
+        except LLMUnavailableError:
+            # Let the caller defer the revision instead of sending back the original
+            raise
         except Exception as e:
             logger.error(f"❌ Content revision failed: {str(e)}")
             return original_content
 
-    def analyze_text(self, prompt: str) -> str:
+    def analyze_text(self, prompt: str, sender: str = None) -> str:
         """
         Analyze text using the LLM
         
         Args:
             prompt (str): The prompt for analysis
+            sender (str): Email address the analysis is for, used for scheduling fairness
             
         Returns:
             str: The LLM's response
         """
+        deadline = self._deadline_for(prompt)
         try:
-            payload = {
-                'model': self.model,
-                'prompt': prompt,
-                'max_tokens': self.context_size
-            }
-            
-            response = requests.post(
-                f"{self.server_url}/api/1.0/text/completion",
-                json=payload,
-                timeout=30
-            )
-            response.raise_for_status()
-            
-            result = response.json().get('choices', [{}])[0].get('text', '').strip()
+            response = self._make_request(prompt, Priority.CLASSIFICATION, sender, deadline)
+            result = response.get('choices', [{}])[0].get('text', '').strip()
             return result
             
         except Exception as e:
@@ -101,5 +272,5 @@ class LlamaService:
             raise
 
 def get_llama_service():
-    """Factory function to create and return a LlamaService instance"""
-    return LlamaService()
\ No newline at end of file
+    """Return the shared LlamaService instance from the service container"""
+    return get_container().get('llama', LlamaService)
\ No newline at end of file
@@ -0,0 +1,157 @@
+import random
+import threading
+import time
+import logging
+from enum import Enum
+from typing import Optional
+from ..config.settings import LLM_SETTINGS
+
+logger = logging.getLogger(__name__)
+
+class LLMUnavailableError(Exception):
+    """Raised when an LLM request is shed or cannot finish before its deadline"""
+
+class AdaptiveLimiter:
+    """
+    Concurrency limiter using AIMD (additive increase, multiplicative decrease).
+
+    The limit grows by roughly one slot per limit-worth of fast, successful
+    calls and is halved whenever a call fails or is slower than its target
+    latency, tracking what the LLM host can actually sustain. The target
+    scales with the call's estimated cost, so a long revision is not judged
+    against the latency expected from a short classification.
+    """
+
+    def __init__(
+        self,
+        min_limit: int = LLM_SETTINGS['MIN_CONCURRENCY'],
+        max_limit: int = LLM_SETTINGS['MAX_CONCURRENCY'],
+        target_latency: float = LLM_SETTINGS['TARGET_LATENCY'],
+        latency_per_token: float = LLM_SETTINGS['TARGET_LATENCY_PER_TOKEN']
+    ):
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.target_latency = target_latency
+        self.latency_per_token = latency_per_token
+        # Start halfway so a healthy host is not throttled to one call at first
+        self._limit = float(max(min_limit, (min_limit + max_limit) // 2))
+        self._in_flight = 0
+        self._cond = threading.Condition()
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+
+    def acquire(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait for a free slot
+
+        Args:
+            timeout (float): Maximum seconds to wait, None to wait forever
+
+        Returns:
+            bool: True if a slot was taken, False on timeout
+        """
+        with self._cond:
+            if not self._cond.wait_for(lambda: self._in_flight < int(self._limit), timeout=timeout):
+                return False
+            self._in_flight += 1
+            return True
+
+    def target_for(self, tokens: int) -> float:
+        """Latency in seconds a call of ``tokens`` estimated tokens should stay under"""
+        return self.target_latency + tokens * self.latency_per_token
+
+    def release(self, latency: float, success: bool, tokens: int = 0):
+        """
+        Return a slot and adjust the limit from the observed outcome
+
+        Args:
+            latency (float): Seconds the call took
+            success (bool): Whether the call succeeded
+            tokens (int): Estimated tokens of the call, used to scale the target latency
+        """
+        with self._cond:
+            self._in_flight -= 1
+            if success and latency <= self.target_for(tokens):
+                self._limit = min(self.max_limit, self._limit + 1 / self._limit)
+            else:
+                self._limit = max(self.min_limit, self._limit / 2)
+                logger.info(f"📉 LLM concurrency limit lowered to {int(self._limit)}")
+            self._cond.notify_all()
+
+class BreakerState(Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+class CircuitBreaker:
+    """
+    Stops sending requests after repeated failures.
+
+    After ``failure_threshold`` consecutive failures the breaker opens and
+    rejects calls for ``reset_timeout`` seconds, then lets a single trial call
+    through; its outcome closes or re-opens the breaker.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = LLM_SETTINGS['BREAKER_FAILURE_THRESHOLD'],
+        reset_timeout: float = LLM_SETTINGS['BREAKER_RESET_TIMEOUT']
+    ):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = BreakerState.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """Return True if a call may be attempted now"""
+        with self._lock:
+            if self.state == BreakerState.CLOSED:
+                return True
+            if self.state == BreakerState.OPEN:
+                if time.monotonic() - self._opened_at < self.reset_timeout:
+                    return False
+                self.state = BreakerState.HALF_OPEN
+                self._trial_in_flight = False
+            if self._trial_in_flight:
+                return False
+            self._trial_in_flight = True
+            return True
+
+    def cancel(self):
+        """
+        Give back a call granted by ``allow()`` that was never attempted,
+        without counting it as a success or a failure
+        """
+        with self._lock:
+            self._trial_in_flight = False
+
+    def record_success(self):
+        with self._lock:
+            if self.state != BreakerState.CLOSED:
+                logger.info("✅ LLM circuit breaker closed")
+            self.state = BreakerState.CLOSED
+            self._failures = 0
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            self._trial_in_flight = False
+            if self.state == BreakerState.HALF_OPEN or self._failures >= self.failure_threshold:
+                if self.state != BreakerState.OPEN:
+                    logger.warning(f"⚠️ LLM circuit breaker opened after {self._failures} failure(s)")
+                self.state = BreakerState.OPEN
+                self._opened_at = time.monotonic()
+
+def backoff_delay(
+    attempt: int,
+    base: float = LLM_SETTINGS['BACKOFF_BASE'],
+    cap: float = LLM_SETTINGS['BACKOFF_MAX']
+) -> float:
+    """Exponential backoff with full jitter for the given retry attempt (0-based)"""
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
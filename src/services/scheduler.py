@@ -0,0 +1,135 @@
+import itertools
+import threading
+import time
+from enum import IntEnum
+from typing import Callable, Dict, List, Optional
+from ..config.settings import LLM_SCHEDULER_SETTINGS
+from .resilience import LLMUnavailableError
+
+class Priority(IntEnum):
+    CLASSIFICATION = 0
+    REVISION = 1
+
+def estimate_tokens(text: str) -> int:
+    """Rough prompt token estimate (about four characters per token)"""
+    return max(1, len(text) // 4)
+
+class _Ticket:
+    def __init__(self, seq: int, priority: Priority, tokens: int, sender: Optional[str], enqueued_at: float):
+        self.seq = seq
+        self.priority = priority
+        self.tokens = tokens
+        self.sender = sender
+        self.enqueued_at = enqueued_at
+
+class LLMScheduler:
+    """
+    Orders LLM work so cheap, urgent calls are not stuck behind big ones.
+
+    Waiting jobs are ranked by a score where lower runs first::
+
+        priority * PRIORITY_WEIGHT
+        + estimated tokens / TOKENS_PER_SECOND
+        + running jobs of the same sender * SENDER_PENALTY
+        - seconds waited * AGING_RATE
+
+    so classifications go before revisions and small prompts before large
+    ones, while aging keeps long jobs from starving and the sender penalty
+    stops one sender from taking every slot. Jobs run in the caller's thread;
+    ``capacity`` bounds how many run at once. ``clock`` supplies the time used
+    for aging and deadlines.
+    """
+
+    def __init__(
+        self,
+        capacity: Callable[[], int],
+        settings: Dict[str, float] = LLM_SCHEDULER_SETTINGS,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.capacity = capacity
+        self.clock = clock
+        self.priority_weight = settings['PRIORITY_WEIGHT']
+        self.tokens_per_second = settings['TOKENS_PER_SECOND']
+        self.aging_rate = settings['AGING_RATE']
+        self.sender_penalty = settings['SENDER_PENALTY']
+        self.queue_timeout = settings['QUEUE_TIMEOUT']
+        self._cond = threading.Condition()
+        self._waiting: List[_Ticket] = []
+        self._running = 0
+        self._running_by_sender: Dict[Optional[str], int] = {}
+        self._seq = itertools.count()
+
+    def _score(self, ticket: _Ticket, now: float) -> float:
+        score = ticket.priority * self.priority_weight
+        score += ticket.tokens / self.tokens_per_second
+        if ticket.sender is not None:
+            score += self._running_by_sender.get(ticket.sender, 0) * self.sender_penalty
+        score -= (now - ticket.enqueued_at) * self.aging_rate
+        return score
+
+    def _next_ticket(self) -> Optional[_Ticket]:
+        """Return the waiting ticket that should run next"""
+        now = self.clock()
+        return min(self._waiting, key=lambda t: (self._score(t, now), t.seq), default=None)
+
+    @property
+    def pending(self) -> int:
+        """Number of jobs waiting for their turn"""
+        with self._cond:
+            return len(self._waiting)
+
+    def _can_run(self, ticket: _Ticket) -> bool:
+        return self._running < max(1, self.capacity()) and self._next_ticket() is ticket
+
+    def run(
+        self,
+        fn: Callable[[], object],
+        priority: Priority,
+        prompt: str,
+        sender: Optional[str] = None,
+        deadline: Optional[float] = None
+    ):
+        """
+        Wait for this job's turn, then run ``fn`` in the calling thread
+
+        Args:
+            fn (Callable): The LLM call to make
+            priority (Priority): Priority class of the job
+            prompt (str): Prompt sent to the LLM, used to estimate cost
+            sender (str): Email address the job is done for, used for fairness
+            deadline (float): ``clock()`` value to stop waiting at,
+                defaults to the queue timeout from now
+
+        Returns:
+            The result of ``fn``
+
+        Raises:
+            LLMUnavailableError: If the job's turn did not come before the deadline
+        """
+        now = self.clock()
+        ticket = _Ticket(next(self._seq), priority, estimate_tokens(prompt), sender, now)
+        timeout = self.queue_timeout if deadline is None else max(0, deadline - now)
+
+        with self._cond:
+            self._waiting.append(ticket)
+            try:
+                if not self._cond.wait_for(lambda: self._can_run(ticket), timeout=timeout):
+                    raise LLMUnavailableError(
+                        f"{priority.name.lower()} job waited {timeout:.0f}s for the LLM without its turn coming"
+                    )
+            finally:
+                self._waiting.remove(ticket)
+                # Removing a ticket can make another one the next to run
+                self._cond.notify_all()
+            self._running += 1
+            self._running_by_sender[sender] = self._running_by_sender.get(sender, 0) + 1
+
+        try:
+            return fn()
+        finally:
+            with self._cond:
+                self._running -= 1
+                self._running_by_sender[sender] -= 1
+                if not self._running_by_sender[sender]:
+                    del self._running_by_sender[sender]
+                self._cond.notify_all()
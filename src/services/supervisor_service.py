@@ -0,0 +1,104 @@
+import multiprocessing
+import signal
+import threading
+import time
+import logging
+from typing import Dict
+from ..config.settings import PENDING_DIR, SERVICE_SETTINGS, WORKER_SETTINGS
+from .container import get_container
+from .email_service import watch_inbox
+from .file_service import watch_directory
+from .lease_service import LeaseStore, WorkerContext
+
+logger = logging.getLogger(__name__)
+
+def _run_worker(index: int, count: int, directory_path: str):
+    """Entry point of a single worker process handling one shard of posts and replies"""
+    # The supervisor handles Ctrl+C and terminates workers itself
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, lambda signum, frame: _stop_worker())
+
+    # Shards are numbered across all hosts so hosts sharing PENDING_DIR never overlap
+    worker = WorkerContext(
+        index=WORKER_SETTINGS['HOST_INDEX'] * count + index,
+        count=WORKER_SETTINGS['HOST_COUNT'] * count,
+        leases=LeaseStore()
+    )
+    container = get_container()
+    container.start()
+    inbox_stop = threading.Event()
+    inbox_thread = threading.Thread(
+        target=watch_inbox,
+        kwargs={'worker': worker, 'stop_event': inbox_stop},
+        name="inbox-monitor",
+        daemon=True
+    )
+    try:
+        logger.info(f"👷 Worker {index + 1}/{count} started ({worker.worker_id})")
+        inbox_thread.start()
+        watch_directory(directory_path, worker=worker)
+    except KeyboardInterrupt:
+        logger.info(f"👋 Worker {index + 1}/{count} stopping")
+    finally:
+        inbox_stop.set()
+        if inbox_thread.is_alive():
+            inbox_thread.join(timeout=SERVICE_SETTINGS['SHUTDOWN_TIMEOUT'])
+        container.stop()
+
+def _stop_worker():
+    # Reuse the KeyboardInterrupt path of watch_directory for a clean shutdown
+    raise KeyboardInterrupt
+
+def _start_worker(index: int, count: int, directory_path: str) -> multiprocessing.Process:
+    process = multiprocessing.Process(
+        target=_run_worker,
+        args=(index, count, directory_path),
+        name=f"blogapprover-worker-{index}",
+        daemon=False
+    )
+    process.start()
+    return process
+
+def run_supervisor(num_workers: int = WORKER_SETTINGS['NUM_WORKERS'], directory_path: str = PENDING_DIR):
+    """
+    Launch one worker process per shard and restart workers that crash.
+
+    When several hosts share ``PENDING_DIR``, each runs its own supervisor with
+    the same ``NUM_WORKERS``, the same ``HOST_COUNT`` and a distinct ``HOST_INDEX``.
+
+    Args:
+        num_workers (int): Number of worker processes (shards)
+        directory_path (str): Path to the directory the workers monitor
+    """
+    restart_delay = WORKER_SETTINGS['RESTART_DELAY']
+    workers: Dict[int, multiprocessing.Process] = {}
+
+    logger.info(f"🧑‍✈️ Starting supervisor with {num_workers} workers")
+    for index in range(num_workers):
+        workers[index] = _start_worker(index, num_workers, directory_path)
+
+    try:
+        while True:
+            time.sleep(1)
+            for index, process in list(workers.items()):
+                if process.is_alive():
+                    continue
+                logger.error(
+                    f"❌ Worker {index + 1}/{num_workers} exited with code {process.exitcode}, "
+                    f"restarting in {restart_delay}s"
+                )
+                process.join()
+                time.sleep(restart_delay)
+                workers[index] = _start_worker(index, num_workers, directory_path)
+    except KeyboardInterrupt:
+        logger.info("👋 Stopping workers (Ctrl+C detected)")
+    finally:
+        for process in workers.values():
+            if process.is_alive():
+                process.terminate()
+        for index, process in workers.items():
+            process.join(timeout=SERVICE_SETTINGS['SHUTDOWN_TIMEOUT'])
+            if process.is_alive():
+                logger.warning(f"⚠️ Worker {index + 1}/{num_workers} did not stop, killing it")
+                process.kill()
+                process.join()
@@ -0,0 +1,107 @@
+import threading
+import time
+import pytest
+from src.services.container import ServiceContainer
+
+class FakeService:
+    def __init__(self):
+        self.healthy = True
+        self.reconnects = 0
+        self.closed = False
+
+    def is_healthy(self):
+        return self.healthy
+
+    def reconnect(self):
+        self.reconnects += 1
+        self.healthy = True
+
+    def close(self, timeout=None):
+        self.closed = True
+
+def test_container_returns_shared_instance():
+    container = ServiceContainer()
+    first = container.get('fake', FakeService)
+    second = container.get('fake', FakeService)
+    assert first is second
+
+def test_container_reconnects_unhealthy_service():
+    container = ServiceContainer()
+    service = container.get('fake', FakeService)
+    service.healthy = False
+
+    container.check_health()
+    assert service.reconnects == 1
+
+def test_container_does_not_check_health_on_get():
+    container = ServiceContainer(health_check_interval=0)
+    service = container.get('fake', FakeService)
+    service.healthy = False
+
+    container.get('fake', FakeService)
+    assert service.reconnects == 0
+
+def test_container_runs_health_checks_in_background():
+    container = ServiceContainer(health_check_interval=0.01)
+    service = container.get('fake', FakeService)
+    service.healthy = False
+
+    container.start()
+    assert container.running
+    for _ in range(100):
+        if service.reconnects:
+            break
+        time.sleep(0.01)
+    container.stop()
+
+    assert service.reconnects >= 1
+    assert not container.running
+
+def test_container_stop_closes_services():
+    container = ServiceContainer()
+    container.start()
+    service = container.get('fake', FakeService)
+
+    container.stop()
+    assert service.closed
+    with pytest.raises(RuntimeError):
+        container.get('fake', FakeService)
+
+def test_slow_factory_does_not_block_other_services():
+    container = ServiceContainer()
+    building = threading.Event()
+    finish = threading.Event()
+
+    def slow_factory():
+        building.set()
+        finish.wait()
+        return FakeService()
+
+    thread = threading.Thread(target=container.get, args=('slow', slow_factory))
+    thread.start()
+    building.wait()
+    try:
+        # Would hang if the registry lock were held during slow_factory()
+        assert container.get('fast', FakeService) is not None
+    finally:
+        finish.set()
+        thread.join()
+
+    assert container.get('slow', FakeService) is container.get('slow', FakeService)
+
+def test_concurrent_gets_build_service_once():
+    container = ServiceContainer()
+    built = []
+
+    def factory():
+        built.append(1)
+        time.sleep(0.05)
+        return FakeService()
+
+    threads = [threading.Thread(target=container.get, args=('shared', factory)) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(built) == 1
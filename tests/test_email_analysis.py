@@ -75,4 +75,60 @@ def test_blog_revision_and_cleanup(test_case):
             mock_email['move_to_trash']()
             logger.info("✅ Email cleanup test passed")
         except Exception as e:
-            pytest.fail(f"Failed to move email to trash: {str(e)}")
\ No newline at end of file
+            pytest.fail(f"Failed to move email to trash: {str(e)}")
+
+
+class FakeLlamaService:
+    def __init__(self):
+        self.calls = []
+
+    def revise_content(self, original_content, feedback, sender=None):
+        self.calls.append((original_content, feedback, sender))
+        return "# Revised Post"
+
+@pytest.fixture
+def offline_handler(monkeypatch):
+    from src.services.email_service import EmailHandler
+    monkeypatch.setattr(EmailHandler, '_setup_account', lambda self: None)
+    llm_service = FakeLlamaService()
+    handler = EmailHandler(llm_service=llm_service)
+    sent = []
+    monkeypatch.setattr(handler, 'send_markdown_email', lambda **kwargs: sent.append(kwargs))
+    return handler, llm_service, sent
+
+def test_handle_approval_response_revises_with_feedback(offline_handler):
+    handler, llm_service, sent = offline_handler
+    processed_email = {
+        'approval_status': ApprovalStatus.NEEDS_REVISION,
+        'subject': 'Re: my-post',
+        'sender': 'reviewer@example.com',
+        'feedback': 'Please add an example.'
+    }
+
+    handler.handle_approval_response(processed_email, "# My Post")
+
+    assert llm_service.calls == [("# My Post", "Please add an example.", "reviewer@example.com")]
+    assert sent[0]['to_recipients'] == ['reviewer@example.com']
+    assert "# Revised Post" in sent[0]['markdown_content']
+
+def test_handle_approval_response_skips_revision_without_post(offline_handler):
+    handler, llm_service, sent = offline_handler
+    processed_email = {
+        'approval_status': ApprovalStatus.NEEDS_REVISION,
+        'subject': 'Re: missing-post',
+        'sender': 'reviewer@example.com',
+        'feedback': 'Please add an example.'
+    }
+
+    handler.handle_approval_response(processed_email, None)
+
+    assert llm_service.calls == []
+    assert sent == []
+
+def test_find_pending_post_matches_reply_subject(offline_handler, tmp_path, monkeypatch):
+    handler, _, _ = offline_handler
+    monkeypatch.setattr('src.services.email_service.PENDING_DIR', str(tmp_path))
+    (tmp_path / 'my-post.md').write_text("# My Post", encoding='utf-8')
+
+    assert handler._find_pending_post('RE: Re: My-Post') == "# My Post"
+    assert handler._find_pending_post('Re: other-post') is None
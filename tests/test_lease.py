@@ -0,0 +1,57 @@
+import time
+from src.services.lease_service import LeaseStore, WorkerContext, shard_for
+
+def test_shard_for_is_stable_and_in_range():
+    keys = [f"post:{i}.md" for i in range(100)]
+    shards = [shard_for(key, 4) for key in keys]
+    assert shards == [shard_for(key, 4) for key in keys]
+    assert set(shards) <= set(range(4))
+
+def test_lease_is_exclusive_until_released(tmp_path):
+    leases = LeaseStore(db_path=str(tmp_path / 'leases.db'))
+    assert leases.acquire('post:a.md', 'worker-1')
+    assert not leases.acquire('post:a.md', 'worker-2')
+
+    leases.release('post:a.md', 'worker-1')
+    assert leases.acquire('post:a.md', 'worker-2')
+
+def test_expired_lease_can_be_taken_over(tmp_path):
+    leases = LeaseStore(db_path=str(tmp_path / 'leases.db'), ttl=0)
+    assert leases.acquire('reply:1', 'worker-1')
+    assert leases.acquire('reply:1', 'worker-2')
+
+def test_worker_only_claims_own_shard(tmp_path):
+    leases = LeaseStore(db_path=str(tmp_path / 'leases.db'))
+    workers = [WorkerContext(index=i, count=3, leases=leases) for i in range(3)]
+
+    claimed = [worker for worker in workers if worker.claim('post:b.md')]
+    assert len(claimed) == 1
+
+def test_completed_version_is_not_claimed_again(tmp_path):
+    leases = LeaseStore(db_path=str(tmp_path / 'leases.db'))
+    assert leases.acquire('post:c.md', 'worker-1', 'v1')
+    leases.mark_completed('post:c.md', 'v1')
+    leases.release('post:c.md', 'worker-1')
+
+    assert not leases.acquire('post:c.md', 'worker-2', 'v1')
+    assert leases.acquire('post:c.md', 'worker-2', 'v2')
+
+def test_renew_extends_only_own_lease(tmp_path):
+    leases = LeaseStore(db_path=str(tmp_path / 'leases.db'), ttl=0)
+    assert leases.acquire('post:d.md', 'worker-1')
+    assert leases.renew('post:d.md', 'worker-1')
+    assert not leases.renew('post:d.md', 'worker-2')
+
+def test_claimed_lease_is_renewed_while_held(tmp_path):
+    leases = LeaseStore(db_path=str(tmp_path / 'leases.db'), ttl=0.3)
+    worker = WorkerContext(index=0, count=1, leases=leases)
+    other = WorkerContext(index=0, count=1, leases=leases)
+    other.worker_id = 'other'
+
+    assert worker.claim('post:e.md')
+    time.sleep(0.6)
+    assert not other.claim('post:e.md')
+
+    worker.release('post:e.md')
+    assert other.claim('post:e.md')
+    other.release('post:e.md')
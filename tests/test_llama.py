@@ -1,4 +1,10 @@
-from src.services.llama_service import get_llama_service
+from src.services.llama_service import LlamaService, get_llama_service
+from src.services.scheduler import Priority
+from src.config.settings import LLM_SETTINGS
+import requests
+from src.services.resilience import BreakerState, LLMUnavailableError
+import time
+import pytest
 import logging
 
 logging.basicConfig(level=logging.INFO)
@@ -33,5 +39,75 @@ def test_content_revision():
     except Exception as e:
         print(f"Test failed: {str(e)}")
 
+class BrokenJsonResponse:
+    status_code = 200
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        raise ValueError("not JSON")
+
+class BrokenJsonSession:
+    def post(self, *args, **kwargs):
+        return BrokenJsonResponse()
+
+def test_unexpected_error_does_not_leave_breaker_stuck():
+    service = LlamaService()
+    service.session = BrokenJsonSession()
+    breaker = service.breakers[Priority.CLASSIFICATION]
+    breaker.failure_threshold = 1
+    breaker.reset_timeout = 0
+    breaker.record_failure()
+
+    with pytest.raises(ValueError):
+        service._attempt_request({}, time.monotonic() + 5)
+
+    assert breaker.state == BreakerState.OPEN
+    assert breaker.allow()
+
+class SlowSession:
+    """Times out every request, recording the timeout it was given"""
+
+    def __init__(self):
+        self.timeouts = []
+
+    def post(self, *args, timeout=None, **kwargs):
+        self.timeouts.append(timeout)
+        raise requests.exceptions.Timeout("read timed out")
+
+def test_attempt_timeout_scales_with_prompt_size():
+    service = LlamaService()
+    service.session = SlowSession()
+
+    service._attempt_request({}, time.monotonic() + 1000, tokens=2000, priority=Priority.REVISION)
+
+    assert service.session.timeouts[0] > LLM_SETTINGS['REQUEST_TIMEOUT']
+
+def test_slow_revisions_do_not_open_classification_breaker():
+    service = LlamaService()
+    service.session = SlowSession()
+
+    for _ in range(LLM_SETTINGS['BREAKER_FAILURE_THRESHOLD']):
+        service._attempt_request({}, time.monotonic() + 1000, tokens=2000, priority=Priority.REVISION)
+
+    assert service.breakers[Priority.REVISION].state == BreakerState.OPEN
+    assert service.breakers[Priority.CLASSIFICATION].state == BreakerState.CLOSED
+    assert service.breakers[Priority.CLASSIFICATION].allow()
+
+def test_waiting_for_limiter_slot_is_not_a_breaker_failure():
+    service = LlamaService()
+    service.session = SlowSession()
+    breaker = service.breakers[Priority.CLASSIFICATION]
+    while service.limiter.acquire(timeout=0):
+        pass
+
+    for _ in range(LLM_SETTINGS['BREAKER_FAILURE_THRESHOLD']):
+        with pytest.raises(LLMUnavailableError):
+            service._attempt_request({}, time.monotonic())
+
+    assert breaker.state == BreakerState.CLOSED
+    assert service.session.timeouts == []
+
 if __name__ == "__main__":
     test_content_revision()
\ No newline at end of file
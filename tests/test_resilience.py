@@ -0,0 +1,76 @@
+from src.services.resilience import AdaptiveLimiter, BreakerState, CircuitBreaker, backoff_delay
+
+def test_limiter_grows_on_fast_success_and_halves_on_failure():
+    limiter = AdaptiveLimiter(min_limit=1, max_limit=8, target_latency=1.0)
+    for _ in range(10):
+        assert limiter.acquire(timeout=0)
+        limiter.release(latency=0.1, success=True)
+    grown = limiter.limit
+    assert grown > 1
+
+    assert limiter.acquire(timeout=0)
+    limiter.release(latency=0.1, success=False)
+    assert limiter.limit == max(1, int(grown / 2))
+
+def test_limiter_blocks_when_full():
+    limiter = AdaptiveLimiter(min_limit=1, max_limit=1, target_latency=1.0)
+    assert limiter.acquire(timeout=0)
+    assert not limiter.acquire(timeout=0.01)
+
+def test_breaker_opens_and_allows_single_trial_after_reset():
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=0)
+    breaker.record_failure()
+    assert breaker.state == BreakerState.CLOSED
+    breaker.record_failure()
+    assert breaker.state == BreakerState.OPEN
+
+    assert breaker.allow()
+    assert breaker.state == BreakerState.HALF_OPEN
+    assert not breaker.allow()
+
+    breaker.record_success()
+    assert breaker.state == BreakerState.CLOSED
+
+def test_open_breaker_rejects_calls():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=60)
+    breaker.record_failure()
+    assert not breaker.allow()
+
+def test_backoff_delay_is_capped():
+    for attempt in range(10):
+        assert 0 <= backoff_delay(attempt, base=1.0, cap=5.0) <= 5.0
+
+def test_half_open_trial_failure_reopens_breaker():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0)
+    breaker.record_failure()
+    assert breaker.allow()
+    breaker.record_failure()
+
+    # The trial outcome was recorded, so a new trial is allowed after the reset timeout
+    assert breaker.allow()
+
+def test_limiter_judges_latency_against_call_cost():
+    limiter = AdaptiveLimiter(min_limit=1, max_limit=8, target_latency=5.0, latency_per_token=0.05)
+    start = limiter.limit
+
+    # Quick classifications mixed with slow but proportionate revisions
+    for latency, tokens in [(1.0, 200), (60.0, 2000), (2.0, 150), (90.0, 3000), (1.5, 100)]:
+        assert limiter.acquire(timeout=0)
+        limiter.release(latency=latency, success=True, tokens=tokens)
+    assert limiter.limit >= start
+
+    # A small call that is as slow as a revision is a sign of overload
+    grown = limiter.limit
+    assert limiter.acquire(timeout=0)
+    limiter.release(latency=60.0, success=True, tokens=100)
+    assert limiter.limit == max(1, grown // 2)
+
+def test_cancelled_trial_frees_half_open_breaker_without_failure():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0)
+    breaker.record_failure()
+    assert breaker.allow()
+    assert not breaker.allow()
+
+    breaker.cancel()
+    assert breaker.state == BreakerState.HALF_OPEN
+    assert breaker.allow()
@@ -0,0 +1,125 @@
+import threading
+import time
+import pytest
+from src.services.resilience import LLMUnavailableError
+from src.services.scheduler import LLMScheduler, Priority, estimate_tokens
+
+SETTINGS = {
+    'PRIORITY_WEIGHT': 60.0,
+    'TOKENS_PER_SECOND': 50.0,
+    'AGING_RATE': 1.0,
+    'SENDER_PENALTY': 30.0,
+    'QUEUE_TIMEOUT': 5,
+}
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+def hold_slot(scheduler, sender=None):
+    """Run a job that keeps its slot until the returned event is set"""
+    started = threading.Event()
+    release = threading.Event()
+
+    def job():
+        started.set()
+        release.wait()
+
+    thread = threading.Thread(target=scheduler.run, args=(job, Priority.REVISION, 'x', sender))
+    thread.start()
+    started.wait()
+    return release, thread
+
+def enqueue(scheduler, order, name, priority, prompt, sender=None):
+    """Queue a job that records its name when it runs, returning once it is waiting"""
+    queued = scheduler.pending
+    thread = threading.Thread(
+        target=scheduler.run,
+        args=(lambda: order.append(name), priority, prompt, sender)
+    )
+    thread.start()
+    while scheduler.pending <= queued:
+        time.sleep(0.001)
+    return thread
+
+def test_estimate_tokens():
+    assert estimate_tokens('') == 1
+    assert estimate_tokens('a' * 400) == 100
+
+def test_classifications_run_before_revisions():
+    scheduler = LLMScheduler(capacity=lambda: 1, settings=SETTINGS, clock=FakeClock())
+    release, blocker = hold_slot(scheduler)
+    order = []
+    threads = [
+        enqueue(scheduler, order, 'revision', Priority.REVISION, 'short post'),
+        enqueue(scheduler, order, 'classification', Priority.CLASSIFICATION, 'short reply'),
+    ]
+
+    release.set()
+    for thread in [blocker] + threads:
+        thread.join()
+    assert order == ['classification', 'revision']
+
+def test_small_prompts_run_before_large_ones():
+    scheduler = LLMScheduler(capacity=lambda: 1, settings=SETTINGS, clock=FakeClock())
+    release, blocker = hold_slot(scheduler)
+    order = []
+    threads = [
+        enqueue(scheduler, order, 'large', Priority.REVISION, 'word ' * 2000),
+        enqueue(scheduler, order, 'small', Priority.REVISION, 'word'),
+    ]
+
+    release.set()
+    for thread in [blocker] + threads:
+        thread.join()
+    assert order == ['small', 'large']
+
+def test_busy_sender_yields_to_others():
+    scheduler = LLMScheduler(capacity=lambda: 2, settings=SETTINGS, clock=FakeClock())
+    release_a, blocker_a = hold_slot(scheduler, 'a@example.com')
+    release_other, blocker_other = hold_slot(scheduler)
+    order = []
+    threads = [
+        enqueue(scheduler, order, 'sender a', Priority.CLASSIFICATION, 'reply', 'a@example.com'),
+        enqueue(scheduler, order, 'sender b', Priority.CLASSIFICATION, 'reply', 'b@example.com'),
+    ]
+
+    # Free one slot while a@example.com still has a job running
+    release_other.set()
+    for thread in [blocker_other] + threads:
+        thread.join()
+    release_a.set()
+    blocker_a.join()
+    assert order == ['sender b', 'sender a']
+
+def test_aging_lets_old_jobs_overtake():
+    clock = FakeClock()
+    scheduler = LLMScheduler(capacity=lambda: 1, settings=SETTINGS, clock=clock)
+    release, blocker = hold_slot(scheduler)
+    order = []
+    threads = [enqueue(scheduler, order, 'old revision', Priority.REVISION, 'post')]
+
+    # Waiting longer than the revision's priority and cost penalties
+    clock.now = 100.0
+    threads += [
+        enqueue(scheduler, order, f'classification {i}', Priority.CLASSIFICATION, 'reply')
+        for i in range(3)
+    ]
+
+    release.set()
+    for thread in [blocker] + threads:
+        thread.join()
+    assert order == ['old revision', 'classification 0', 'classification 1', 'classification 2']
+
+def test_job_gives_up_at_its_deadline():
+    scheduler = LLMScheduler(capacity=lambda: 1, settings=SETTINGS)
+    release, blocker = hold_slot(scheduler)
+    try:
+        with pytest.raises(LLMUnavailableError):
+            scheduler.run(lambda: None, Priority.CLASSIFICATION, 'reply', deadline=time.monotonic() + 0.05)
+    finally:
+        release.set()
+        blocker.join()